@@ -1,16 +1,15 @@
 import requests
 import logging
 import json
+import csv
 import time
 import getpass
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-# Configureer logging
+from conductor_logging import configure_logging, log_request
+
+# Logging wordt in __main__ geconfigureerd (asynchroon, JSON-lines)
 task_logger = logging.getLogger()
-log_handler = logging.FileHandler('script-log.log')
-formatter = logging.Formatter('%(asctime)s %(levelname)s:%(message)s')
-log_handler.setFormatter(formatter)
-task_logger.setLevel(logging.INFO)
-task_logger.addHandler(log_handler)
 
 # Globale request session voor performance
 def create_session(token=None):
@@ -34,22 +33,24 @@ def get_bearer_token(fqdn, username, password, session_noauth):
 
 def api_get(path, session):
     url = f"https://{fqdn_or_ip}{path}"
+    start = time.perf_counter()
     resp = session.get(url)
     resp.raise_for_status()
-    task_logger.info("GET %s returned %s", path, resp.status_code)
+    log_request("GET", path, resp.status_code, time.perf_counter() - start)
     return resp.json()
 
 
 def api_post(path, session, payload=None):
     url = f"https://{fqdn_or_ip}{path}"
+    start = time.perf_counter()
     resp = session.post(url, json=payload or {})
     resp.raise_for_status()
-    task_logger.info("POST %s payload=%s returned %s", path, payload, resp.status_code)
+    log_request("POST", path, resp.status_code, time.perf_counter() - start,
+                name=(payload or {}).get('name'))
     return resp
 
-# Use-case 1: Clone neighborhood op hub
-def clone_on_hub(session):
-    hub = input("Enter the hub router name: ").strip()
+# Verzamel alle neighborhoods op een hub: naam -> (node, device-interface, network-interface)
+def crawl_hub_neighborhoods(hub, session):
     nodes = api_get(f"/api/v1/config/candidate/authority/router/{hub}/node", session)
     all_nbh = {}
     for node in nodes:
@@ -69,6 +70,12 @@ def clone_on_hub(session):
                 )
                 for nbh in nbhs:
                     all_nbh[nbh['name']] = (node_name, dev_name, net_name)
+    return all_nbh
+
+# Use-case 1: Clone neighborhood op hub
+def clone_on_hub(session):
+    hub = input("Enter the hub router name: ").strip()
+    all_nbh = crawl_hub_neighborhoods(hub, session)
     print("Available neighborhoods to clone:")
     for i, name in enumerate(all_nbh, 1): print(f"{i}. {name}")
     choice = int(input("Select number: ")) - 1
@@ -210,9 +217,132 @@ def add_via_router_list(session):
                             print(f"Error adding to {rname}/{node_name}/{dev['name']}/{net['name']}: {e}")
     print("Done.")
 
+# Use-case 4: Batch clone over meerdere hubs
+def error_detail(e):
+    # Korte foutomschrijving voor het rapport; onverwachte fouten met hun type
+    if isinstance(e, requests.exceptions.RequestException):
+        return str(e)
+    return f"{type(e).__name__}: {e}"
+
+
+def job_result(hub, line, src_nbh, dest_nbh, status, latency_ms):
+    return {'line': line, 'hub': hub, 'source': src_nbh, 'destination': dest_nbh,
+            'status': status, 'latency_ms': latency_ms}
+
+
+def clone_jobs_on_hub(hub, jobs, session):
+    # Eén sessie per hub-thread, met dezelfde headers (token) als de hoofdsessie
+    hub_session = create_session()
+    hub_session.headers.update(session.headers)
+    results = []
+    start = time.perf_counter()
+    try:
+        all_nbh = crawl_hub_neighborhoods(hub, hub_session)
+    except Exception as e:
+        crawl_ms = round((time.perf_counter() - start) * 1000, 1)
+        reason = error_detail(e)
+        task_logger.error("Crawl van hub %s mislukt: %s", hub, reason)
+        for line, src_nbh, dest_nbh in jobs:
+            results.append(job_result(hub, line, src_nbh, dest_nbh, f"crawl failed: {reason}", crawl_ms))
+        return results
+    crawl_ms = round((time.perf_counter() - start) * 1000, 1)
+    task_logger.info("Hub %s gecrawld in %.1f ms (%d neighborhoods)", hub, crawl_ms, len(all_nbh))
+    for line, src_nbh, dest_nbh in jobs:
+        job_start = time.perf_counter()
+        if src_nbh not in all_nbh:
+            status = "source not found"
+        elif dest_nbh in all_nbh:
+            status = "destination exists, skipped"
+        else:
+            node_name, dev_name, net_name = all_nbh[src_nbh]
+            try:
+                api_post(
+                    f"/api/v1/config/candidate/authority/router/{hub}/node/{node_name}/device-interface/{dev_name}/network-interface/{net_name}/neighborhood/{src_nbh}/clone",
+                    hub_session,
+                    {"name": dest_nbh}
+                )
+                all_nbh[dest_nbh] = all_nbh[src_nbh]
+                status = "OK"
+            except Exception as e:
+                status = f"error: {error_detail(e)}"
+        results.append(job_result(hub, line, src_nbh, dest_nbh, status,
+                                  round((time.perf_counter() - job_start) * 1000, 1)))
+        task_logger.info("Clone %s: %s -> %s: %s", hub, src_nbh, dest_nbh, status)
+    return results
+
+
+def batch_clone(session, max_workers=8):
+    # Lees jobs: CSV met kolommen hub,source,destination; per hub (regelnummer, source, destination)
+    filename = input("Enter clone job file [clone_jobs.csv]: ").strip() or 'clone_jobs.csv'
+    jobs_by_hub = {}
+    bad_lines = []
+    try:
+        with open(filename, newline='', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            missing = {'hub', 'source', 'destination'} - set(reader.fieldnames or [])
+            if missing:
+                print(f"Kolommen ontbreken in {filename}: {', '.join(sorted(missing))}")
+                return
+            for row in reader:
+                # Ontbrekende velden zijn None bij te korte regels
+                hub, src_nbh, dest_nbh = ((row.get(k) or '').strip() for k in ('hub', 'source', 'destination'))
+                if not (hub and src_nbh and dest_nbh):
+                    bad_lines.append(reader.line_num)
+                    continue
+                jobs_by_hub.setdefault(hub, []).append((reader.line_num, src_nbh, dest_nbh))
+    except (OSError, UnicodeDecodeError, csv.Error) as e:
+        print(f"Fout bij lezen van {filename}: {e}")
+        return
+    if bad_lines:
+        print(f"Ongeldige regels overgeslagen (hub, source of destination leeg): {', '.join(map(str, bad_lines))}")
+    n_jobs = sum(len(j) for j in jobs_by_hub.values())
+    if not n_jobs:
+        print("Geen jobs gevonden in bestand.")
+        return
+    print(f"Loaded {n_jobs} clone jobs over {len(jobs_by_hub)} hubs from {filename}.")
+    if input("Start batch clone? (yes/no): ").strip().lower() != 'yes':
+        print("Aborted.")
+        return
+    # Elke hub wordt één keer gecrawld; hubs lopen parallel, jobs per hub op volgorde
+    start = time.perf_counter()
+    results = []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(jobs_by_hub))) as pool:
+        futures = {pool.submit(clone_jobs_on_hub, hub, jobs, session): hub for hub, jobs in jobs_by_hub.items()}
+        for fut in as_completed(futures):
+            hub = futures[fut]
+            try:
+                results.extend(fut.result())
+            except Exception as e:
+                task_logger.error("Batch clone op hub %s mislukt: %s", hub, e)
+                for line, src_nbh, dest_nbh in jobs_by_hub[hub]:
+                    results.append(job_result(hub, line, src_nbh, dest_nbh, f"error: {error_detail(e)}", 0.0))
+    # Per hub in de volgorde van het jobbestand, zodat geketende clones zichtbaar blijven
+    results.sort(key=lambda r: (r['hub'], r['line']))
+    for r in results:
+        print(f"{r['hub']}: {r['source']} -> {r['destination']}  {r['status']}  ({r['latency_ms']} ms)")
+    ok = sum(1 for r in results if r['status'] == 'OK')
+    print(f"Klaar in {time.perf_counter() - start:.1f}s: {ok}/{len(results)} clones OK.")
+    report = input("Save report to file (leeg = niet opslaan): ").strip()
+    if report:
+        try:
+            with open(report, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.DictWriter(f, fieldnames=['line', 'hub', 'source', 'destination', 'status', 'latency_ms'])
+                writer.writeheader()
+                writer.writerows(results)
+        except OSError as e:
+            print(f"Fout bij schrijven van {report}: {e}")
+            return
+        print(f"Report saved to {report}.")
+
 if __name__ == '__main__':
+    import argparse
     import urllib3
     urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+    parser = argparse.ArgumentParser(description="Interactief beheer van neighborhoods op de Conductor")
+    parser.add_argument('--request-log-sample', type=float, default=0.01,
+                        help="Fractie van GET-requests om te loggen, 0.0-1.0 (default: 0.01); wijzigingen worden altijd gelogd")
+    args = parser.parse_args()
+    configure_logging('script-log.log', console=False, request_sample_rate=args.request_log_sample)
     fqdn_or_ip = input("Conductor FQDN/IP: ").strip()
     user = input("Username: ").strip()
     pwd = getpass.getpass("Password: ").strip()
@@ -225,6 +355,7 @@ if __name__ == '__main__':
         print("1) Clone neighborhood op hub")
         print("2) Generate router-list voor reference neighborhood")
         print("3) Add neighborhood to spokes via router-list")
+        print("5) Batch clone neighborhoods op meerdere hubs")
         print("4) Exit")
         opt = input("Kies optie: ").strip()
         if opt == '1':
@@ -236,5 +367,7 @@ if __name__ == '__main__':
         elif opt == '4':
             print("Tot ziens!")
             break
+        elif opt == '5':
+            batch_clone(sess)
         else:
             print("Ongeldige keuze, probeer opnieuw.")
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Gedeelde, niet-blokkerende logging voor de conductor-scripts.
+
+Alle handlers hangen achter een QueueHandler: de aanroeper zet alleen een
+record op een queue, een achtergrondthread (QueueListener) doet de
+bestands- en console-writes. Het logbestand bevat JSON-lines events.
+
+Per-request events naar de Conductor gaan via log_request() naar de logger
+'conductor.request'. Leesverkeer (GET) wordt gesampled, zodat de logkosten
+niet meegroeien met het aantal requests; wijzigingen (POST/DELETE/...) worden
+altijd gelogd.
+"""
+
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import time
+
+REQUEST_LOGGER = 'conductor.request'
+SAMPLED_METHODS = frozenset({'GET', 'HEAD'})
+
+_listener = None
+_request_sample_rate = 0.0
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """
+    Formatteer een record als één JSON-object per regel.
+    Velden uit extra={'event': {...}} worden in het object opgenomen.
+    """
+
+    def format(self, record):
+        data = {
+            'ts':     time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(record.created))
+                      + f'.{int(record.msecs):03d}',
+            'level':  record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'msg':    record.getMessage(),
+        }
+        event = getattr(record, 'event', None)
+        if event:
+            data.update(event)
+        if record.exc_info:
+            data['exc'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            data['exc'] = record.exc_text
+        return json.dumps(data, default=str)
+
+
+class _TracebackQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler die een traceback als exc_text meegeeft in plaats van hem in
+    msg te plakken, zodat de JSON-formatter er een eigen 'exc' veld van maakt.
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def configure_logging(logfile='script.log', level=logging.INFO, console=True,
+                      request_sample_rate=0.01):
+    """
+    Zet asynchrone logging op naar bestand (JSON-lines) en optioneel console.
+    request_sample_rate bepaalt welk deel (0.0 - 1.0) van de GET-requests
+    wordt gelogd; wijzigingen worden altijd gelogd. Meerdere aanroepen
+    vervangen de vorige configuratie.
+    """
+    global _listener, _request_sample_rate
+
+    logger = logging.getLogger()
+    logger.setLevel(level)
+
+    if _listener is not None:
+        _listener.stop()
+        for h in _listener.handlers:
+            h.close()
+    for h in list(logger.handlers):
+        if isinstance(h, logging.handlers.QueueHandler):
+            logger.removeHandler(h)
+
+    handlers = []
+
+    # File handler: structured JSON-lines
+    fh = logging.FileHandler(logfile, encoding='utf-8')
+    fh.setLevel(level)
+    fh.setFormatter(JsonLinesFormatter())
+    handlers.append(fh)
+
+    # Console handler: leesbaar formaat
+    if console:
+        ch = logging.StreamHandler()
+        ch.setLevel(level)
+        ch.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(message)s'))
+        handlers.append(ch)
+
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(_TracebackQueueHandler(log_queue))
+    _listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    _listener.start()
+    _request_sample_rate = max(0.0, min(1.0, request_sample_rate))
+
+    return logger
+
+
+def shutdown_logging():
+    """
+    Stop de listener-thread nadat de queue is leeggeschreven.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
+
+
+def log_request(method, path, status, elapsed=None, always=False, **fields):
+    """
+    Log één API-request als structured event. Leesrequests (GET/HEAD) zijn
+    onderhevig aan sampling en kosten dan alleen een random()-aanroep;
+    wijzigingen, of always=True, worden altijd gelogd.
+    """
+    if not always and method.upper() in SAMPLED_METHODS:
+        if _request_sample_rate <= 0.0:
+            return
+        if _request_sample_rate < 1.0 and random.random() >= _request_sample_rate:
+            return
+    logger = logging.getLogger(REQUEST_LOGGER)
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    event = {'event': 'api_request', 'method': method, 'path': path, 'status': status}
+    if elapsed is not None:
+        event['elapsed_ms'] = round(elapsed * 1000, 1)
+    event.update(fields)
+    logger.info("%s %s returned %s", method, path, status, extra={'event': event})
@@ -2,37 +2,17 @@
 # -*- coding: utf-8 -*-
 
 import json
-import logging
 import argparse
 import getpass
+import time
 import requests
 import urllib3
 
+from conductor_logging import configure_logging, log_request
+
 # Suppress only the single InsecureRequestWarning from urllib3 needed.
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
-def configure_logging(logfile='script.log'):
-    """
-    Zet logging op naar bestand en console.
-    """
-    logger = logging.getLogger()
-    logger.setLevel(logging.INFO)
-
-    # File handler
-    fh = logging.FileHandler(logfile)
-    fh.setLevel(logging.INFO)
-    fmt = logging.Formatter('%(asctime)s %(levelname)s %(message)s')
-    fh.setFormatter(fmt)
-    logger.addHandler(fh)
-
-    # Console handler
-    ch = logging.StreamHandler()
-    ch.setLevel(logging.INFO)
-    ch.setFormatter(fmt)
-    logger.addHandler(ch)
-
-    return logger
-
 def create_session(token=None):
     """
     Maak een requests.Session aan met JSON headers en (optioneel) Bearer token.
@@ -67,8 +47,10 @@ def api_get(fqdn, path, sess):
     Doe een GET-request naar https://{fqdn}{path} en return JSON-body.
     """
     url = f"https://{fqdn}{path}"
+    start = time.perf_counter()
     resp = sess.get(url)
     resp.raise_for_status()
+    log_request("GET", path, resp.status_code, time.perf_counter() - start)
     return resp.json()
 
 def find_device_interfaces_with_neighborhood(fqdn, sess, neighborhood):
@@ -158,11 +140,13 @@ def parse_args():
                         help="Naam van de neighborhood om op te filteren")
     parser.add_argument('--output',       required=False,
                         help="Pad voor output (bijv. results.csv of .json)")
+    parser.add_argument('--request-log-sample', type=float, default=0.01,
+                        help="Fractie van GET-requests om te loggen, 0.0-1.0 (default: 0.01)")
     return parser.parse_args()
 
 def main():
     args = parse_args()
-    logger = configure_logging()
+    logger = configure_logging(request_sample_rate=args.request_log_sample)
     password = getpass.getpass("Password: ")
 
     logger.info("Authenticatie bij %s als %s", args.fqdn, args.username)
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import csv
+import json
+import logging
+import argparse
+import getpass
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+import urllib3
+
+from conductor_logging import configure_logging, log_request
+from find_interfaces_with_nbh import api_get, create_session, get_bearer_token
+
+# Suppress InsecureRequestWarning (if self-signed certs used)
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+ROUTER_PATH = "/api/v1/config/candidate/authority/router"
+
+_local = threading.local()
+
+
+def thread_session(token):
+    """
+    Geef de requests.Session van de huidige worker-thread (één per thread).
+    """
+    sess = getattr(_local, 'sess', None)
+    if sess is None:
+        sess = create_session(token)
+        _local.sess = sess
+    return sess
+
+
+def api_post(fqdn, path, sess, payload):
+    url = f"https://{fqdn}{path}"
+    start = time.perf_counter()
+    resp = sess.post(url, json=payload)
+    resp.raise_for_status()
+    log_request("POST", path, resp.status_code, time.perf_counter() - start)
+    return resp
+
+
+def api_delete(fqdn, path, sess):
+    url = f"https://{fqdn}{path}"
+    start = time.perf_counter()
+    resp = sess.delete(url)
+    resp.raise_for_status()
+    log_request("DELETE", path, resp.status_code, time.perf_counter() - start)
+    return resp
+
+
+def crawl_router(fqdn, sess, rname, src_nbh, dst_nbh):
+    """
+    Loop één router af (nodes → device-interfaces → network-interfaces) en
+    return de interfaces waar src_nbh op staat, met de vlag of dst_nbh er al is.
+    """
+    found = []
+    nodes = api_get(fqdn, f"{ROUTER_PATH}/{rname}/node", sess)
+    for n in nodes:
+        nname = n.get('name')
+        devs = api_get(fqdn, f"{ROUTER_PATH}/{rname}/node/{nname}/device-interface", sess)
+        for d in devs:
+            dname = d.get('name')
+            nets = api_get(
+                fqdn,
+                f"{ROUTER_PATH}/{rname}/node/{nname}/device-interface/{dname}/network-interface",
+                sess
+            )
+            for net in nets:
+                netname = net.get('name')
+                nbhs = api_get(
+                    fqdn,
+                    f"{ROUTER_PATH}/{rname}/node/{nname}"
+                    f"/device-interface/{dname}/network-interface/{netname}/neighborhood",
+                    sess
+                )
+                names = {nb.get('name') for nb in nbhs}
+                if src_nbh in names:
+                    found.append({
+                        'router':            rname,
+                        'node':              nname,
+                        'device_interface':  dname,
+                        'network_interface': netname,
+                        'has_dst':           dst_nbh in names,
+                    })
+    return found
+
+
+def error_detail(e):
+    """
+    Korte foutomschrijving voor het rapport; onverwachte fouten met hun type.
+    """
+    if isinstance(e, requests.exceptions.RequestException):
+        return str(e)
+    return f"{type(e).__name__}: {e}"
+
+
+def migrate_interface(fqdn, sess, iface, src_nbh, dst_nbh, remove_src, clone, dry_run):
+    """
+    Voer de read-modify-write uit op één network-interface:
+    voeg dst_nbh toe (of clone src_nbh) en verwijder daarna optioneel src_nbh.
+    src_nbh wordt alleen verwijderd als dst_nbh aanwezig is.
+    """
+    path = (
+        f"{ROUTER_PATH}/{iface['router']}"
+        f"/node/{iface['node']}"
+        f"/device-interface/{iface['device_interface']}"
+        f"/network-interface/{iface['network_interface']}/neighborhood"
+    )
+    actions = []
+    start = time.perf_counter()
+    try:
+        if iface['has_dst']:
+            actions.append('dst-present')
+        elif dry_run:
+            actions.append('would-add')
+        elif clone:
+            api_post(fqdn, f"{path}/{src_nbh}/clone", sess, {'name': dst_nbh})
+            actions.append('cloned')
+        else:
+            api_post(fqdn, path, sess, {'name': dst_nbh})
+            actions.append('added')
+
+        if remove_src:
+            if dry_run:
+                actions.append('would-remove')
+            else:
+                api_delete(fqdn, f"{path}/{src_nbh}", sess)
+                actions.append('removed')
+        ok, detail = True, "OK"
+    except Exception as e:
+        ok, detail = False, error_detail(e)
+        logging.error(
+            "Migratie mislukt op %s/%s/%s/%s: %s",
+            iface['router'], iface['node'], iface['device_interface'],
+            iface['network_interface'], e
+        )
+
+    return {
+        'router':            iface['router'],
+        'node':              iface['node'],
+        'device_interface':  iface['device_interface'],
+        'network_interface': iface['network_interface'],
+        'actions':           '+'.join(actions),
+        'ok':                ok,
+        'detail':            detail,
+        'elapsed_ms':        round((time.perf_counter() - start) * 1000, 1),
+    }
+
+
+def migrate_router(fqdn, token, rname, src_nbh, dst_nbh, remove_src, clone, dry_run):
+    """
+    Crawl één router en migreer direct zijn interfaces, in volgorde.
+    Zo loopt de wijziging van deze router al terwijl andere nog worden gecrawld.
+    """
+    try:
+        sess = thread_session(token)
+        interfaces = crawl_router(fqdn, sess, rname, src_nbh, dst_nbh)
+    except Exception as e:
+        logging.error("Crawl van router %s mislukt: %s", rname, e)
+        return [router_error(rname, 'crawl', e)]
+    return [
+        migrate_interface(fqdn, sess, iface, src_nbh, dst_nbh, remove_src, clone, dry_run)
+        for iface in interfaces
+    ]
+
+
+def router_error(rname, action, e):
+    """
+    Rapportregel voor een fout die een hele router treft.
+    """
+    return {
+        'router': rname, 'node': '', 'device_interface': '', 'network_interface': '',
+        'actions': action, 'ok': False, 'detail': error_detail(e), 'elapsed_ms': 0.0,
+    }
+
+
+def migrate_neighborhood(fqdn, sess, token, src_nbh, dst_nbh, remove_src=False,
+                         clone=False, dry_run=False, routers=None, workers=8,
+                         results=None):
+    """
+    Migreer alle interfaces met src_nbh naar dst_nbh in één gepipelinede pass.
+    Routers worden parallel verwerkt (maximaal `workers` tegelijk); binnen een
+    router gebeuren de wijzigingen sequentieel. Return één resultaat per interface,
+    in de volgorde waarin routers klaar zijn.
+    Resultaten worden aan `results` toegevoegd (indien meegegeven), zodat de
+    aanroeper ook bij een afgebroken run een rapport heeft.
+    """
+    if results is None:
+        results = []
+    if routers is None:
+        routers = [r.get('name') for r in api_get(fqdn, ROUTER_PATH, sess)]
+    logging.info("Migratie '%s' -> '%s' over %d routers (%d workers)",
+                 src_nbh, dst_nbh, len(routers), workers)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(migrate_router, fqdn, token, rname, src_nbh, dst_nbh,
+                        remove_src, clone, dry_run): rname
+            for rname in routers
+        }
+        for fut in as_completed(futures):
+            try:
+                router_results = fut.result()
+            except Exception as e:
+                logging.error("Router %s mislukt: %s", futures[fut], e)
+                router_results = [router_error(futures[fut], 'migrate', e)]
+            results.extend(router_results)
+
+    return results
+
+
+def write_report(records, output_path=None):
+    """
+    Print het per-interface rapport naar stdout of schrijf naar CSV/JSON bestand.
+    """
+    if not records:
+        print("Geen interfaces met deze neighborhood gevonden.")
+        return
+
+    if not output_path:
+        for rec in records:
+            status = "OK" if rec['ok'] else f"FOUT: {rec['detail']}"
+            print(f"{rec['router']}/{rec['node']}/{rec['device_interface']}/"
+                  f"{rec['network_interface']}  {rec['actions']}  {status}")
+    else:
+        ext = output_path.rsplit('.', 1)[-1].lower()
+        if ext == 'json':
+            with open(output_path, 'w', encoding='utf-8') as f:
+                json.dump(records, f, indent=2)
+        else:
+            with open(output_path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.DictWriter(f, fieldnames=records[0].keys())
+                writer.writeheader()
+                writer.writerows(records)
+        print(f"Rapport geschreven naar {output_path}")
+
+
+def parse_args():
+    """
+    Parse command-line arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description="Migreer network-interfaces van neighborhood A naar B in één pass")
+    parser.add_argument('--fqdn',         required=True,
+                        help="Conductor FQDN of IP-adres")
+    parser.add_argument('--username',     required=True,
+                        help="Gebruikersnaam voor login")
+    parser.add_argument('--from',         required=True, dest='src',
+                        help="Huidige neighborhood (A)")
+    parser.add_argument('--to',           required=True, dest='dst',
+                        help="Nieuwe neighborhood (B)")
+    parser.add_argument('--remove',       action='store_true',
+                        help="Verwijder A nadat B is toegevoegd")
+    parser.add_argument('--clone',        action='store_true',
+                        help="Maak B aan via clone van A (neemt instellingen van A over)")
+    parser.add_argument('--router-list',  required=False,
+                        help="Beperk tot routers uit dit bestand (één per regel)")
+    parser.add_argument('--workers',      type=int, default=8,
+                        help="Aantal routers dat tegelijk wordt verwerkt (default: 8)")
+    parser.add_argument('--dry-run',      action='store_true',
+                        help="Alleen rapporteren, geen wijzigingen doorvoeren")
+    parser.add_argument('--output',       required=False,
+                        help="Pad voor rapport (bijv. results.csv of .json)")
+    parser.add_argument('--output-log',   default='script.log',
+                        help="Pad naar logfile (default: script.log)")
+    parser.add_argument('--request-log-sample', type=float, default=0.01,
+                        help="Fractie van GET-requests om te loggen, 0.0-1.0 (default: 0.01)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    logger = configure_logging(args.output_log,
+                               request_sample_rate=args.request_log_sample)
+
+    if args.src == args.dst:
+        logger.error("Bron- en doel-neighborhood zijn gelijk: %s", args.src)
+        return
+
+    routers = None
+    if args.router_list:
+        try:
+            with open(args.router_list) as f:
+                routers = [line.strip() for line in f if line.strip()]
+        except OSError as e:
+            logger.error("Fout bij lezen van %s: %s", args.router_list, e)
+            return
+
+    password = getpass.getpass("Password: ")
+    logger.info("Authenticatie bij %s als %s", args.fqdn, args.username)
+    sess_noauth = create_session()
+    try:
+        token = get_bearer_token(args.fqdn, args.username, password, sess_noauth)
+    except Exception as e:
+        logger.error("Login mislukt: %s", e)
+        return
+    sess = create_session(token)
+
+    start = time.perf_counter()
+    results = []
+    try:
+        migrate_neighborhood(
+            args.fqdn, sess, token, args.src, args.dst,
+            remove_src=args.remove, clone=args.clone, dry_run=args.dry_run,
+            routers=routers, workers=max(1, args.workers), results=results
+        )
+    except Exception as e:
+        logger.error("Fout tijdens migratie: %s", e)
+
+    results.sort(key=lambda r: (r['router'], r['node'],
+                                r['device_interface'], r['network_interface']))
+    write_report(results, args.output)
+    success = sum(1 for r in results if r['ok'])
+    failed  = len(results) - success
+    print(f"Klaar in {time.perf_counter() - start:.1f}s: "
+          f"{success} successen, {failed} fouten. Zie logfile voor details.")
+
+if __name__ == '__main__':
+    main()
@@ -6,32 +6,17 @@ import json
 import logging
 import argparse
 import getpass
+import time
 import requests
 import urllib3
 
+from conductor_logging import configure_logging, log_request
+
 # ——————————————————————————————————————————————————————————
 # Suppress InsecureRequestWarning (if self-signed certs used)
 # ——————————————————————————————————————————————————————————
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
-# ——————————————————————————————————————————————————————————
-# Logging configuration
-# ——————————————————————————————————————————————————————————
-def configure_logging(logfile='script.log'):
-    logger = logging.getLogger()
-    logger.setLevel(logging.INFO)
-    fmt = logging.Formatter('%(asctime)s %(levelname)s %(message)s')
-
-    fh = logging.FileHandler(logfile)
-    fh.setFormatter(fmt)
-    logger.addHandler(fh)
-
-    ch = logging.StreamHandler()
-    ch.setFormatter(fmt)
-    logger.addHandler(ch)
-
-    return logger
-
 # ——————————————————————————————————————————————————————————
 # REST-API wrappers
 # ——————————————————————————————————————————————————————————
@@ -63,8 +48,11 @@ def get_bearer_token(fqdn, username, password, sess):
 
 def api_post(fqdn, path, sess, payload):
     url = f"https://{fqdn}{path}"
+    start = time.perf_counter()
     resp = sess.post(url, json=payload)
     resp.raise_for_status()
+    log_request("POST", path, resp.status_code, time.perf_counter() - start,
+                name=payload.get('name'))
     return resp.json()
 
 # ——————————————————————————————————————————————————————————
@@ -95,10 +83,6 @@ def set_neighborhood_from_csv(fqdn, sess, csv_path, new_neighborhood):
 
             try:
                 api_post(fqdn, path, sess, payload)
-                logging.info(
-                    "Added neighborhood '%s' to %s/%s/%s/%s",
-                    new_neighborhood, r, n, d, net
-                )
                 results.append((r, n, d, net, True, "OK"))
             except Exception as e:
                 logging.error(
@@ -126,6 +110,8 @@ def parse_args():
                         help="Naam van de nieuwe neighborhood om te zetten")
     parser.add_argument('--output-log',   default='script.log',
                         help="Pad naar logfile (default: script.log)")
+    parser.add_argument('--request-log-sample', type=float, default=0.01,
+                        help="Fractie van GET-requests om te loggen, 0.0-1.0 (default: 0.01)")
     return parser.parse_args()
 
 # ——————————————————————————————————————————————————————————
@@ -134,7 +120,8 @@ def parse_args():
 
 def main():
     args = parse_args()
-    logger = configure_logging(args.output_log)
+    logger = configure_logging(args.output_log,
+                               request_sample_rate=args.request_log_sample)
     password = getpass.getpass("Password: ")
 
     # Authentication